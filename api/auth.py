@@ -5,6 +5,7 @@ from config import Config
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 from bson import ObjectId
+from core import offload
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -32,7 +33,7 @@ def register():
         "name": data["name"],
         "email": data["email"].lower().strip(),
         "phone": data["phone"],
-        "password": generate_password_hash(data["password"]),
+        "password": offload.run("cpu", generate_password_hash, data["password"]),
         "created_at": datetime.utcnow()
     }
 
@@ -59,7 +60,7 @@ def login():
         return jsonify({"error": "Email and password required"}), 400
 
     user = users.find_one({"email": data["email"].lower().strip()})
-    if not user or not check_password_hash(user["password"], data["password"]):
+    if not user or not offload.run("cpu", check_password_hash, user["password"], data["password"]):
         return jsonify({"error": "Invalid email or password"}), 401
 
     token = create_token(user["_id"])
@@ -0,0 +1,91 @@
+import json
+from flask import Blueprint, request, jsonify
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
+from jose import jwt
+from config import Config
+from core import offload
+from core.live import LiveSession
+
+bp = Blueprint('live', __name__, url_prefix='/api')
+sock = Sock()
+
+
+def get_user_from_auth():
+    """JWT from the Authorization header or ?token= (browsers can't set
+    headers on a WebSocket). Falls back to demo_user like the other APIs."""
+    auth = request.headers.get("Authorization", "")
+    parts = auth.split()
+    token = parts[1] if len(parts) == 2 and parts[0].lower() == "bearer" else request.args.get("token")
+    if not token:
+        return "demo_user"
+    try:
+        payload = jwt.decode(token, Config.JWT_SECRET, algorithms=["HS256"])
+        return str(payload.get("sub", "demo_user"))
+    except Exception:
+        return "demo_user"
+
+
+@bp.before_request
+def require_gevent():
+    # an open stream holds its worker for the whole meeting; with sync
+    # workers a handful of meetings would take the API down
+    if not offload.gevent_active():
+        return jsonify({"error": "live meetings need SERVE_MODE=gevent"}), 503
+
+
+@sock.route('/live', bp=bp)
+def live(ws):
+    """
+    Live meeting stream.
+    Query: ?token=<jwt>&language=<code|auto>&sample_rate=16000 (8000-48000)
+    Client -> server: binary frames of 16-bit LE mono PCM,
+                      text {"type": "stop"} to finish.
+    Server -> client: {"type": "started", "upload_id"}, {"type": "transcript",
+                      "seq", "text"}, {"type": "notes", "text"},
+                      {"type": "done", "upload_id", "note_id"}, {"type": "error"}.
+    """
+    try:
+        session = LiveSession(
+            get_user_from_auth(),
+            language=request.args.get("language", "auto"),
+            sample_rate=int(request.args.get("sample_rate", 16000)),
+        )
+    except ValueError as e:
+        ws.send(json.dumps({"type": "error", "error": str(e)}))
+        return
+    ws.send(json.dumps({"type": "started", "upload_id": session.upload_id}))
+
+    connected = True
+    try:
+        while True:
+            # short timeout so finished transcripts go out between frames
+            msg = ws.receive(timeout=0.2)
+            if isinstance(msg, (bytes, bytearray)):
+                session.feed(msg)
+            elif isinstance(msg, str):
+                try:
+                    if json.loads(msg).get("type") == "stop":
+                        break
+                except ValueError:
+                    pass
+            for out in session.poll():
+                ws.send(json.dumps(out))
+    except ConnectionClosed:
+        connected = False
+
+    # client gone or stopped: still persist what we heard
+    try:
+        last = session.flush()
+        if connected:
+            for out in last:
+                ws.send(json.dumps(out))
+        result = session.close()
+    except Exception as e:
+        if connected:
+            ws.send(json.dumps({"type": "error", "error": f"saving live session failed: {e}"}))
+        return
+    finally:
+        session.shutdown()
+    if connected:
+        ws.send(json.dumps({"type": "done", **result}))
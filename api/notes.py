@@ -1,9 +1,11 @@
-from flask import Blueprint, jsonify, send_file, request
-from models.mongo_models import notes
-from core.utils import export_to_pdf, export_to_docx
+from flask import Blueprint, jsonify, send_file, request, Response, stream_with_context
+from models.mongo_models import notes, notes_read
+from core.utils import export_to_pdf, export_to_docx, render_export, stream_zip
 from bson import ObjectId
 from jose import jwt
 from config import Config
+from core import offload
+from datetime import datetime, timedelta
 import os
 
 bp = Blueprint('notes', __name__, url_prefix='/api')
@@ -24,20 +26,29 @@ def get_user_from_auth():
     return "demo_user"
 
 
-def get_note_by_id(note_id: str):
-    """Try fetching note by string _id or ObjectId."""
-    n = notes.find_one({"_id": note_id})
+def _find_note(coll, note_id: str):
+    n = coll.find_one({"_id": note_id})
     if not n:
         try:
-            n = notes.find_one({"_id": ObjectId(note_id)})
+            n = coll.find_one({"_id": ObjectId(note_id)})
         except:
             n = None
     return n
 
 
+def get_note_by_id(note_id: str, secondary_ok: bool = False):
+    """Try fetching note by string _id or ObjectId."""
+    if secondary_ok:
+        # secondary may lag behind a just-finished note -> fall back to primary
+        n = _find_note(notes_read, note_id)
+        if n:
+            return n
+    return _find_note(notes, note_id)
+
+
 @bp.route('/notes/<note_id>', methods=['GET'])
 def get_note(note_id):
-    n = get_note_by_id(note_id)
+    n = get_note_by_id(note_id, secondary_ok=True)
     if not n:
         return jsonify({"error": "Note not found"}), 404
 
@@ -58,7 +69,7 @@ def history():
     if user_id == "demo_user":
         return jsonify({"error": "Login required to view history"}), 401
 
-    docs = list(notes.find({"user_id": user_id}).sort("created_at", -1).limit(50))
+    docs = list(notes_read.find({"user_id": user_id}).sort("created_at", -1).limit(50))
     out = [
         {
             "note_id": str(d["_id"]),
@@ -78,7 +89,7 @@ def download_pdf(note_id):
 
     os.makedirs("storage/exports", exist_ok=True)
     path = f"storage/exports/{note_id}.pdf"
-    export_to_pdf(n.get("final_notes", ""), path)
+    offload.run("export", export_to_pdf, n.get("final_notes", ""), path)
     return send_file(path, as_attachment=True,mimetype="application/pdf")
 
 
@@ -90,5 +101,105 @@ def download_docx(note_id):
 
     os.makedirs("storage/exports", exist_ok=True)
     path = f"storage/exports/{note_id}.docx"
-    export_to_docx(n.get("final_notes", ""), path)
+    offload.run("export", export_to_docx, n.get("final_notes", ""), path)
     return send_file(path, as_attachment=True, mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+
+
+def _render_entry(n, fmt):
+    created = n.get("created_at")
+    prefix = created.strftime("%Y-%m-%d_") if created else ""
+    name = f"{prefix}{n['_id']}.{fmt}"
+    try:
+        return name, render_export(n.get("final_notes", ""), fmt)
+    except Exception as e:
+        return name + ".error.txt", str(e).encode("utf-8")
+
+
+def _rendered_entries(cursor, formats):
+    """Render notes on the export pool, yielding entries as they complete.
+    At most 2x pool size renders are held at once, so memory stays flat.
+
+    This does not render in parallel: reportlab/python-docx hold the GIL,
+    so the pool only overlaps rendering with the cursor fetches and with
+    sending the ZIP, and under gevent keeps the hub free for other
+    requests. A large export costs about one core for its whole duration."""
+    window = 2 * Config.EXPORT_WORKERS
+    pending = set()
+    for n in cursor:
+        for fmt in formats:
+            pending.add(offload.submit("export", _render_entry, n, fmt))
+        while len(pending) >= window:
+            done, pending = offload.wait_first(pending)
+            for f in done:
+                yield f.result()
+    while pending:
+        done, pending = offload.wait_first(pending)
+        for f in done:
+            yield f.result()
+
+
+@bp.route('/download/zip', methods=['POST'])
+def download_zip():
+    """
+    Bulk export as a streamed ZIP. Body: {"note_ids": [...]} or
+    {"from": "YYYY-MM-DD", "to": "YYYY-MM-DD"} over the user's history,
+    plus optional "format": "pdf" | "docx" | "both" (default "pdf").
+    """
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "JSON body must be an object"}), 400
+    fmt = data.get("format", "pdf")
+    if fmt not in ("pdf", "docx", "both"):
+        return jsonify({"error": "format must be pdf, docx or both"}), 400
+    formats = ["pdf", "docx"] if fmt == "both" else [fmt]
+
+    note_ids = data.get("note_ids")
+    if note_ids:
+        if not isinstance(note_ids, list) or len(note_ids) > Config.BULK_EXPORT_MAX_NOTES:
+            return jsonify({"error": f"note_ids must be a list of at most {Config.BULK_EXPORT_MAX_NOTES}"}), 400
+        ids = list(note_ids) + [ObjectId(i) for i in note_ids if ObjectId.is_valid(i)]
+        query = {"_id": {"$in": ids}}
+        user_id = get_user_from_auth()
+        if user_id != "demo_user":
+            # signed-in users only get their own notes, whatever ids they send
+            query["user_id"] = user_id
+    else:
+        user_id = get_user_from_auth()
+        if user_id == "demo_user":
+            return jsonify({"error": "Login required to export history"}), 401
+        try:
+            created = {}
+            if data.get("from"):
+                created["$gte"] = datetime.fromisoformat(data["from"])
+            if data.get("to"):
+                to = data["to"]
+                if len(to) == 10:
+                    # date-only "to" means the whole day is included
+                    created["$lt"] = datetime.fromisoformat(to) + timedelta(days=1)
+                else:
+                    created["$lte"] = datetime.fromisoformat(to)
+        except (TypeError, ValueError):
+            return jsonify({"error": "from/to must be ISO dates"}), 400
+        query = {"user_id": user_id}
+        if created:
+            query["created_at"] = created
+        # don't silently truncate the archive
+        if notes_read.count_documents(query, limit=Config.BULK_EXPORT_MAX_NOTES + 1) > Config.BULK_EXPORT_MAX_NOTES:
+            return jsonify({
+                "error": f"range has more than {Config.BULK_EXPORT_MAX_NOTES} notes, narrow from/to"
+            }), 400
+
+    # one batched query; the cursor is consumed lazily while streaming
+    cursor = (
+        notes_read.find(query, {"final_notes": 1, "created_at": 1})
+        .sort("created_at", -1)
+        .limit(Config.BULK_EXPORT_MAX_NOTES)
+        .batch_size(2 * Config.EXPORT_WORKERS)
+    )
+    return Response(
+        stream_with_context(stream_zip(_rendered_entries(cursor, formats))),
+        mimetype="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="notes.zip"'}
+    )
@@ -0,0 +1,35 @@
+from flask import Blueprint, jsonify, request, Response
+from models.mongo_models import profiles
+from core import profiling
+from bson import ObjectId
+
+bp = Blueprint('profiles', __name__, url_prefix='/api')
+
+
+@bp.route('/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    Stored request/task profile. Needs the same X-Profile token used to
+    record it. ?format=folded returns collapsed stacks as plain text, ready
+    for flamegraph.pl or speedscope.
+    """
+    if not profiling.requested(request):
+        return jsonify({"error": "forbidden"}), 403
+    if not ObjectId.is_valid(profile_id):
+        return jsonify({"error": "not found"}), 404
+    p = profiles.find_one({"_id": ObjectId(profile_id)})
+    if not p:
+        return jsonify({"error": "not found"}), 404
+
+    if request.args.get("format") == "folded":
+        return Response(p.get("folded", ""), mimetype="text/plain")
+
+    return jsonify({
+        "profile_id": str(p["_id"]),
+        "kind": p.get("kind"),
+        "target": p.get("target"),
+        "created_at": p["created_at"].isoformat() if p.get("created_at") else None,
+        "duration_ms": p.get("duration_ms"),
+        "stages": p.get("stages", []),
+        "functions": p.get("functions", []),
+    })
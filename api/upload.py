@@ -1,12 +1,13 @@
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 import os, uuid, requests
-from models.mongo_models import uploads
+from models.mongo_models import uploads, batches, get_fs
 from datetime import datetime
 from core.ai_pipeline import process_upload
-from core.tasks import process_upload_task   # 🔹 Celery task import
+from core.tasks import process_upload_task, dispatch_batch, batch_summary, finalize_batch_task   # 🔹 Celery task import
 from jose import jwt
 from config import Config
+from core import profiling
 
 bp = Blueprint('upload', __name__, url_prefix='/api')
 
@@ -35,9 +36,10 @@ def upload_file_to_assemblyai(file_obj):
     """Upload raw file stream to AssemblyAI and return upload_url"""
     headers = {"authorization": Config.SPEECH_API_KEY}
     response = requests.post(
-        "https://api.assemblyai.com/v2/upload",
+        f"{Config.ASSEMBLYAI_BASE_URL}/upload",
         headers=headers,
-        data=file_obj
+        data=file_obj,
+        timeout=120
     )
     response.raise_for_status()
     return response.json()["upload_url"]
@@ -86,7 +88,8 @@ def upload_file():
 
     # Background async processing
     if background:
-        process_upload_task.delay(uid, upload_url, user_id, language or "auto")
+        process_upload_task.delay(uid, upload_url, user_id, language or "auto",
+                                  profile=profiling.requested(request))
         return jsonify({"upload_id": uid}), 201
     else:
         note_id = process_upload(uid, upload_url, user_id, language=language or "auto")
@@ -108,3 +111,120 @@ def status(upload_id):
         "progress": u.get("progress", {}),
         "extract_duration": u.get("extract_duration", 0)
     })
+
+
+@bp.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    """
+    Many files and/or URLs in one request. Nothing is sent to the speech
+    provider from here: the batch and its upload docs are created first,
+    files are staged in GridFS (shared by web and workers), and each
+    worker streams its file to AssemblyAI as the first step of the chord.
+    """
+    user_id = get_user_from_auth()
+    data = request.get_json(silent=True) if request.is_json else {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "JSON body must be an object"}), 400
+    files = request.files.getlist('files') if not request.is_json else []
+    urls = data.get('urls') if request.is_json else request.form.getlist('urls')
+    if urls is not None and (not isinstance(urls, list) or not all(isinstance(u, str) for u in urls)):
+        return jsonify({"error": "urls must be a list of strings"}), 400
+    urls = [u for u in (urls or []) if u]
+    language = data.get('language') or request.form.get('language') or request.args.get('language') or "auto"
+    callback_url = data.get('callback_url') or request.form.get('callback_url')
+
+    if not files and not urls:
+        return jsonify({"error": "files or urls required (.mp3/.wav/.mp4/.m4a)"}), 400
+    if len(files) + len(urls) > Config.BATCH_MAX_ITEMS:
+        return jsonify({"error": f"max {Config.BATCH_MAX_ITEMS} items per batch"}), 400
+    bad = [f.filename for f in files if not allowed(f.filename)]
+    if bad:
+        return jsonify({"error": "unsupported file type", "files": bad}), 400
+    max_bytes = Config.BATCH_MAX_FILE_MB * 1024 * 1024
+    too_big = []
+    for f in files:
+        f.stream.seek(0, os.SEEK_END)
+        if f.stream.tell() > max_bytes:
+            too_big.append(f.filename)
+        f.stream.seek(0)
+    if too_big:
+        return jsonify({"error": f"max {Config.BATCH_MAX_FILE_MB}MB per file", "files": too_big}), 413
+
+    batch_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    items = [
+        {"upload_id": str(uuid.uuid4()), "file": f, "filename": f.filename, "is_url": False, "staged": True}
+        for f in files
+    ] + [
+        {"upload_id": str(uuid.uuid4()), "source": u, "filename": os.path.basename(u), "is_url": True}
+        for u in urls
+    ]
+
+    batches.insert_one({
+        "_id": batch_id,
+        "user_id": user_id,
+        "status": "uploading",
+        "total": len(items),
+        "callback_url": callback_url,
+        "created_at": now,
+    })
+    uploads.insert_many([
+        {
+            "_id": it["upload_id"],
+            "user_id": user_id,
+            "batch_id": batch_id,
+            "filename": it["filename"],
+            "upload_url": it.get("source"),
+            "status": "uploading" if it.get("staged") else "queued",
+            "created_at": now,
+            "progress": {"stage": "queued", "percent": 0},
+            "language": language,
+        }
+        for it in items
+    ], ordered=False)
+
+    # stage files where the workers can read them; the provider upload is theirs
+    fs = get_fs()
+    ready = []
+    for it in items:
+        f = it.pop("file", None)
+        if f is not None:
+            try:
+                file_id = fs.upload_from_stream(
+                    secure_filename(f.filename), f.stream, metadata={"upload_id": it["upload_id"]}
+                )
+            except Exception as e:
+                uploads.update_one(
+                    {"_id": it["upload_id"]},
+                    {"$set": {"status": "failed", "error": f"staging failed: {e}"}}
+                )
+                continue
+            it["source"] = str(file_id)
+            uploads.update_one({"_id": it["upload_id"]}, {"$set": {"staged_file_id": it["source"]}})
+        ready.append(it)
+
+    batches.update_one({"_id": batch_id}, {"$set": {"status": "processing"}})
+    if ready:
+        dispatch_batch(batch_id, ready, user_id, language, Config.BATCH_PARALLELISM)
+    else:
+        finalize_batch_task.delay([], batch_id)
+
+    return jsonify({
+        "batch_id": batch_id,
+        "upload_ids": [it["upload_id"] for it in items]
+    }), 201
+
+
+@bp.route('/batch/<batch_id>', methods=['GET'])
+def batch_status(batch_id):
+    b = batches.find_one({"_id": batch_id})
+    if not b:
+        return jsonify({"error": "not found"}), 404
+    summary = batch_summary(batch_id)
+    return jsonify({
+        "batch_id": batch_id,
+        "status": b.get("status"),
+        "created_at": b["created_at"].isoformat() if b.get("created_at") else None,
+        "finished_at": b["finished_at"].isoformat() if b.get("finished_at") else None,
+        **summary
+    })
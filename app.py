@@ -5,6 +5,9 @@ from api.auth import bp as auth_bp
 from api.upload import bp as up_bp
 from api.notes import bp as notes_bp
 from api.health import bp as health_bp   
+from api.profiles import bp as profiles_bp
+from api.live import bp as live_bp, sock
+from core import profiling
 
 def create_app():
     app = Flask(__name__)
@@ -17,6 +20,10 @@ def create_app():
     app.register_blueprint(up_bp)
     app.register_blueprint(notes_bp)
     app.register_blueprint(health_bp)    
+    app.register_blueprint(profiles_bp)
+    app.register_blueprint(live_bp)
+    sock.init_app(app)
+    profiling.init_app(app)
     return app
 
 if __name__ == "__main__":
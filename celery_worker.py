@@ -1,5 +1,7 @@
 from celery import Celery
+from celery.signals import worker_process_shutdown
 from config import Config
+from models.mongo_models import close_client
 
 # 🔹 Celery init
 celery = Celery(
@@ -19,6 +21,12 @@ celery.conf.update(
     broker_connection_retry_on_startup=True,  # retry if Redis not ready yet
 )
 
+@worker_process_shutdown.connect
+def _close_mongo(**kwargs):
+    # each prefork child owns its own Mongo pool (see models.mongo_models)
+    close_client()
+
+
 @celery.task(name="health.check")
 def health_check():
     """
@@ -5,11 +5,42 @@ load_dotenv()
 class Config:
     PORT = int(os.getenv("PORT", 8000))
     MONGO_URI = os.getenv("MONGO_URI")
+    # Per-process pool (each gunicorn/Celery child gets its own)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 20))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 30000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    MONGO_PROGRESS_W = int(os.getenv("MONGO_PROGRESS_W", 1))  # 0 = unacknowledged
+    MONGO_READ_SECONDARY = os.getenv("MONGO_READ_SECONDARY", "true").lower() != "false"
     JWT_SECRET = os.getenv("JWT_SECRET")
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "./storage/uploads")
     LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # groq or gemini
     LLM_API_KEY = os.getenv("LLM_API_KEY")
     SPEECH_PROVIDER = os.getenv("SPEECH_PROVIDER", "whisper")
     SPEECH_API_KEY = os.getenv("SPEECH_API_KEY")  # <-- yahan # use karo
+    ASSEMBLYAI_BASE_URL = os.getenv("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com/v2")  # point at a stub for load tests
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Profiling: send "X-Profile: <PROFILE_TOKEN>" to profile one request
+    # (and the upload task it starts); PROFILE_TASKS=true profiles every task
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+    PROFILE_TASKS = os.getenv("PROFILE_TASKS", "false").lower() == "true"
+    PROFILE_INTERVAL_MS = int(os.getenv("PROFILE_INTERVAL_MS", 5))
+    # Live meetings (WebSocket audio stream)
+    LIVE_STT_ENGINE = os.getenv("LIVE_STT_ENGINE", "assemblyai")  # assemblyai or faster_whisper
+    LIVE_WHISPER_MODEL = os.getenv("LIVE_WHISPER_MODEL", "small")
+    LIVE_STT_WORKERS = int(os.getenv("LIVE_STT_WORKERS", 4))  # native threads, local engine only (shared)
+    LIVE_SESSION_STT_CONCURRENCY = int(os.getenv("LIVE_SESSION_STT_CONCURRENCY", 3))  # segments in flight per session
+    LIVE_MIN_SEGMENT_SECONDS = float(os.getenv("LIVE_MIN_SEGMENT_SECONDS", 1.5))
+    LIVE_MAX_SEGMENT_SECONDS = float(os.getenv("LIVE_MAX_SEGMENT_SECONDS", 6))
+    LIVE_SILENCE_RMS = float(os.getenv("LIVE_SILENCE_RMS", 300))  # int16 scale
+    LIVE_NOTES_INTERVAL = int(os.getenv("LIVE_NOTES_INTERVAL", 60))  # seconds between rolling notes
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 50))
+    CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", 4))  # password hashing etc.
+    EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 4))  # overlaps rendering with I/O; rendering itself holds the GIL
+    BULK_EXPORT_MAX_NOTES = int(os.getenv("BULK_EXPORT_MAX_NOTES", 500))
+    BATCH_PARALLELISM = int(os.getenv("BATCH_PARALLELISM", 4))  # files processed at once per batch
+    BATCH_MAX_FILE_MB = int(os.getenv("BATCH_MAX_FILE_MB", 200))  # per file, staged in GridFS until a worker uploads it
 
@@ -4,9 +4,11 @@ import time
 from datetime import datetime
 
 from core.providers import call_llm
-from core.utils import extract_audio_from_video, translate_text, optimize_for_tokens
+from core.utils import extract_audio_from_video, translate_text
+from core.text_prep import clean_text, optimize_for_tokens
+from core import profiling
 from config import Config
-from models.mongo_models import uploads, notes
+from models.mongo_models import uploads, notes, progress_uploads
 
 
 ASSEMBLY_HEADERS = {"authorization": Config.SPEECH_API_KEY}
@@ -21,21 +23,26 @@ def upload_to_assemblyai(file_path: str) -> str:
         # Already a remote URL (Zoom/Meet/AssemblyAI etc.)
         return file_path
 
-    headers = {"authorization": Config.SPEECH_API_KEY}
     with open(file_path, "rb") as f:
-        response = requests.post(
-            "https://api.assemblyai.com/v2/upload",
-            headers=headers,
-            data=f,
-            timeout=120
-        )
-        response.raise_for_status()
-        return response.json()["upload_url"]
+        return upload_stream_to_assemblyai(f)
+
+
+def upload_stream_to_assemblyai(stream) -> str:
+    """Uploads any file-like object (e.g. a GridFS download stream) and returns upload_url."""
+    headers = {"authorization": Config.SPEECH_API_KEY}
+    response = requests.post(
+        f"{Config.ASSEMBLYAI_BASE_URL}/upload",
+        headers=headers,
+        data=stream,
+        timeout=120
+    )
+    response.raise_for_status()
+    return response.json()["upload_url"]
 
 
 # --- Transcribe when we already have an AssemblyAI upload_url ---
 def transcribe_with_assemblyai_url(audio_url: str, language: str = "auto"):
-    endpoint = "https://api.assemblyai.com/v2/transcript"
+    endpoint = f"{Config.ASSEMBLYAI_BASE_URL}/transcript"
     json_data = {"audio_url": audio_url, "language_detection": True}
     if language and language != "auto":
         json_data["language_code"] = language
@@ -69,7 +76,7 @@ def transcribe(file_or_url: str, language: str = None, is_url: bool = False):
     upload_url = upload_to_assemblyai(file_or_url)
 
     # 2. Request transcription
-    endpoint = "https://api.assemblyai.com/v2/transcript"
+    endpoint = f"{Config.ASSEMBLYAI_BASE_URL}/transcript"
     headers = {"authorization": Config.SPEECH_API_KEY}
     json_data = {"audio_url": upload_url, "language_detection": True}
     if language and language != "auto":
@@ -92,15 +99,6 @@ def transcribe(file_or_url: str, language: str = None, is_url: bool = False):
         time.sleep(2)
 
 
-# --- Clean transcript ---
-def clean_text(text):
-    if not text:
-        return text
-    for w in [" um ", " uh ", " you know ", " like "]:
-        text = text.replace(w, " ")
-    return " ".join(text.split())
-
-
 # --- Summarization ---
 def generate_notes(transcript):
     prompt = f"""You are an advanced multilingual meeting summarizer.
@@ -135,8 +133,9 @@ Transcript extract:
 
 # --- Progress helper ---
 def set_progress(upload_id, stage, percent):
+    profiling.mark(stage)
     try:
-        uploads.update_one(
+        progress_uploads.update_one(
             {"_id": upload_id},
             {"$set": {
                 "status": stage,
@@ -147,6 +146,50 @@ def set_progress(upload_id, stage, percent):
         pass
 
 
+# --- Transcript -> saved note (shared by uploads and live sessions) ---
+def notes_from_transcript(upload_id, user_id, transcript, detected_lang):
+    # 3. Translate if not English
+    if detected_lang.lower() != "en":
+        set_progress(upload_id, "translating", 55)
+        translated = translate_text(transcript, src=detected_lang, target="en")
+        set_progress(upload_id, "translated", 65)
+    else:
+        translated = transcript
+
+    # 4. Clean + optimize
+    cleaned = clean_text(translated)
+    cleaned = optimize_for_tokens(cleaned, max_tokens=3000)
+    set_progress(upload_id, "optimized", 75)
+
+    # 5. Summarize
+    set_progress(upload_id, "summarizing", 85)
+    notes_text = generate_notes(cleaned)
+    set_progress(upload_id, "summarized", 95)
+
+    # 6. Save DB
+    note_doc = {
+        "user_id": user_id,
+        "upload_id": upload_id,
+        "raw_transcript": transcript,
+        "translated_transcript": translated if translated != transcript else None,
+        "cleaned_transcript": cleaned,
+        "final_notes": notes_text,
+        "detected_language": detected_lang,
+        "created_at": datetime.utcnow()
+    }
+    res = notes.insert_one(note_doc)
+
+    uploads.update_one(
+        {"_id": upload_id},
+        {"$set": {
+            "status": "done",
+            "note_id": str(res.inserted_id),   # 👈 yaha bhi string
+            "progress": {"stage": "done", "percent": 100}
+        }}
+    )
+    return {"note_id": str(res.inserted_id)}
+
+
 # --- Main pipeline ---
 def process_upload(upload_id, file_path_or_url, user_id, language="auto", is_url=False):
     """
@@ -170,46 +213,8 @@ def process_upload(upload_id, file_path_or_url, user_id, language="auto", is_url
         transcript, detected_lang = transcribe(file_path_or_url, is_url=is_url, language=language)
         set_progress(upload_id, "transcribed", 45)
 
-        # 3. Translate if not English
-        if detected_lang.lower() != "en":
-            set_progress(upload_id, "translating", 55)
-            translated = translate_text(transcript, src=detected_lang, target="en")
-            set_progress(upload_id, "translated", 65)
-        else:
-            translated = transcript
-
-        # 4. Clean + optimize
-        cleaned = clean_text(translated)
-        cleaned = optimize_for_tokens(cleaned, max_tokens=3000)
-        set_progress(upload_id, "optimized", 75)
-
-        # 5. Summarize
-        set_progress(upload_id, "summarizing", 85)
-        notes_text = generate_notes(cleaned)
-        set_progress(upload_id, "summarized", 95)
-
-        # 6. Save DB
-        note_doc = {
-            "user_id": user_id,
-            "upload_id": upload_id,
-            "raw_transcript": transcript,
-            "translated_transcript": translated if translated != transcript else None,
-            "cleaned_transcript": cleaned,
-            "final_notes": notes_text,
-            "detected_language": detected_lang,
-            "created_at": datetime.utcnow()
-        }
-        res = notes.insert_one(note_doc)
-
-        uploads.update_one(
-            {"_id": upload_id},
-            {"$set": {
-                "status": "done",
-                "note_id": str(res.inserted_id),   # 👈 yaha bhi string
-                "progress": {"stage": "done", "percent": 100}
-            }}
-        )
-        return {"note_id": str(res.inserted_id)}
+        # 3-6. Translate, clean, summarize, save
+        return notes_from_transcript(upload_id, user_id, transcript, detected_lang)
 
     except Exception as e:
         uploads.update_one(
@@ -0,0 +1,270 @@
+import io
+import threading
+import time
+import uuid
+import wave
+from collections import Counter, deque
+from datetime import datetime
+
+import numpy as np
+import requests
+
+from config import Config
+from core import offload
+from core.ai_pipeline import generate_notes, notes_from_transcript, transcribe_with_assemblyai_url
+from core.text_prep import clean_text
+from models.mongo_models import uploads, progress_uploads
+
+# --- Live meetings ---
+# The client streams 16-bit little-endian mono PCM over a WebSocket. Audio is
+# cut into short segments at pauses (or at a hard cap), each segment is
+# transcribed while more audio keeps arriving, and every LIVE_NOTES_INTERVAL
+# seconds the *new* transcript text is summarized into a rolling note.
+# Remote STT and the notes LLM call only wait on HTTP, so each session gets
+# its own small green pools for them (one session can't starve another, and
+# notes never queue behind segments). The local engine is CPU-bound and
+# shares the native "live" pool instead. On close the whole transcript goes through the normal
+# notes_from_transcript path, so the result lands in the usual uploads/notes
+# schema.
+
+
+# --- Speech-to-text engines (one segment at a time) ---
+# Each engine returns (text, detected_language).
+def _wav_bytes(pcm, sample_rate):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+def stt_assemblyai(pcm, sample_rate, language):
+    """Stand-in for a streaming STT: each segment is a short batch job."""
+    r = requests.post(
+        f"{Config.ASSEMBLYAI_BASE_URL}/upload",
+        headers={"authorization": Config.SPEECH_API_KEY},
+        data=_wav_bytes(pcm, sample_rate),
+        timeout=30,
+    )
+    r.raise_for_status()
+    text, detected = transcribe_with_assemblyai_url(r.json()["upload_url"], language=language)
+    return text or "", detected
+
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+
+def stt_faster_whisper(pcm, sample_rate, language):
+    """Local engine (optional dependency: faster-whisper)."""
+    global _whisper_model
+    with _whisper_lock:
+        if _whisper_model is None:
+            from faster_whisper import WhisperModel
+            _whisper_model = WhisperModel(Config.LIVE_WHISPER_MODEL, compute_type="int8")
+    audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    if sample_rate != 16000:
+        n = int(len(audio) * 16000 / sample_rate)
+        audio = np.interp(np.linspace(0, len(audio), n, endpoint=False), np.arange(len(audio)), audio)
+        audio = audio.astype(np.float32)
+    segments, info = _whisper_model.transcribe(
+        audio, language=None if language in (None, "auto") else language, beam_size=1
+    )
+    return " ".join(s.text.strip() for s in segments), info.language
+
+
+STT_ENGINES = {
+    "assemblyai": stt_assemblyai,
+    "faster_whisper": stt_faster_whisper,
+}
+CPU_BOUND_ENGINES = {"faster_whisper"}
+
+
+# --- Segmenter ---
+class Segmenter:
+    """
+    Buffers PCM and cuts a segment once there is at least `min_seconds` of
+    audio followed by a short pause, or `max_seconds` regardless. Silent
+    segments are dropped so they never reach the STT engine.
+    """
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.buf = bytearray()
+        self.min_bytes = int(Config.LIVE_MIN_SEGMENT_SECONDS * sample_rate) * 2
+        self.max_bytes = int(Config.LIVE_MAX_SEGMENT_SECONDS * sample_rate) * 2
+        self.pause_bytes = int(0.3 * sample_rate) * 2
+        if not 0 < self.pause_bytes <= self.max_bytes:
+            # a zero-sized cut would never drain the buffer in feed()
+            raise ValueError("segment sizes must be positive")
+
+    @staticmethod
+    def _rms(pcm):
+        a = np.frombuffer(pcm, dtype="<i2").astype(np.float32)
+        return float(np.sqrt(np.mean(a * a))) if len(a) else 0.0
+
+    def _emit(self, n):
+        seg = bytes(self.buf[:n])
+        del self.buf[:n]
+        return seg if self._rms(seg) >= Config.LIVE_SILENCE_RMS else None
+
+    def feed(self, data):
+        self.buf.extend(data)
+        if len(self.buf) % 2:
+            # keep whole samples only; the odd byte waits for the next frame
+            tail = self.buf[-1:]
+            del self.buf[-1:]
+        else:
+            tail = b""
+        out = []
+        while len(self.buf) >= self.max_bytes:
+            out.append(self._emit(self.max_bytes))
+        if len(self.buf) >= self.min_bytes and self._rms(self.buf[-self.pause_bytes:]) < Config.LIVE_SILENCE_RMS:
+            out.append(self._emit(len(self.buf)))
+        self.buf.extend(tail)
+        return [s for s in out if s]
+
+    def flush(self):
+        n = len(self.buf) - len(self.buf) % 2
+        if n < self.pause_bytes:
+            return []
+        seg = self._emit(n)
+        return [seg] if seg else []
+
+
+# --- Session ---
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+
+
+class LiveSession:
+    def __init__(self, user_id, language="auto", sample_rate=16000, engine=None):
+        engine = engine or Config.LIVE_STT_ENGINE
+        if engine not in STT_ENGINES:
+            raise ValueError(f"unknown live STT engine: {engine}")
+        if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"sample_rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE}")
+        self.stt = STT_ENGINES[engine]
+        self.stt_pool = None if engine in CPU_BOUND_ENGINES else offload.io_pool(Config.LIVE_SESSION_STT_CONCURRENCY)
+        self.notes_pool = offload.io_pool(1)
+        self.user_id = user_id
+        self.language = language or "auto"
+        self.sample_rate = sample_rate
+        self.segmenter = Segmenter(sample_rate)
+        self.pending = deque()   # (seq, future) in arrival order
+        self.texts = []          # transcript pieces in order
+        self.languages = Counter()  # per-segment languages reported by the engine
+        self.seq = 0
+        self.summarized_upto = 0
+        self.rolling_notes = []
+        self.notes_future = None
+        self.last_notes_at = time.monotonic()
+
+        self.upload_id = str(uuid.uuid4())
+        uploads.insert_one({
+            "_id": self.upload_id,
+            "user_id": user_id,
+            "filename": f"live-{datetime.utcnow():%Y%m%d-%H%M%S}",
+            "upload_url": None,
+            "source": "live",
+            "status": "live",
+            "created_at": datetime.utcnow(),
+            "progress": {"stage": "live", "percent": 0},
+            "language": self.language,
+        })
+
+    def _submit(self, segments):
+        for seg in segments:
+            self.seq += 1
+            if self.stt_pool is None:
+                fut = offload.submit("live", self.stt, seg, self.sample_rate, self.language)
+            else:
+                fut = self.stt_pool.submit(self.stt, seg, self.sample_rate, self.language)
+            self.pending.append((self.seq, fut))
+
+    def feed(self, data):
+        self._submit(self.segmenter.feed(data))
+
+    def _collect(self, wait=False):
+        """Take finished segment transcripts off the queue, in order."""
+        out = []
+        while self.pending and (wait or self.pending[0][1].done()):
+            seq, fut = self.pending.popleft()
+            try:
+                text, lang = fut.result()
+                text = text.strip()
+            except Exception as e:
+                out.append({"type": "error", "seq": seq, "error": str(e)})
+                continue
+            if text:
+                self.texts.append(text)
+                if lang and lang != "auto":
+                    self.languages[lang] += 1
+                out.append({"type": "transcript", "seq": seq, "text": text})
+        return out
+
+    def detected_language(self):
+        if self.languages:
+            return self.languages.most_common(1)[0][0]
+        return self.language
+
+    def poll(self):
+        """Collect finished transcripts/notes, in order. Returns messages for the client."""
+        out = self._collect()
+
+        if self.notes_future is not None and self.notes_future.done():
+            fut, self.notes_future = self.notes_future, None
+            try:
+                self.rolling_notes.append(fut.result())
+                out.append({"type": "notes", "text": self.rolling_notes[-1]})
+                progress_uploads.update_one(
+                    {"_id": self.upload_id},
+                    {"$set": {"live_transcript": " ".join(self.texts), "live_notes": self.rolling_notes}}
+                )
+            except Exception as e:
+                out.append({"type": "error", "error": f"notes refresh failed: {e}"})
+
+        if (
+            self.notes_future is None
+            and len(self.texts) > self.summarized_upto
+            and time.monotonic() - self.last_notes_at >= Config.LIVE_NOTES_INTERVAL
+        ):
+            # only the material since the last refresh goes to the LLM
+            new_text = clean_text(" ".join(self.texts[self.summarized_upto:]))
+            self.summarized_upto = len(self.texts)
+            self.last_notes_at = time.monotonic()
+            self.notes_future = self.notes_pool.submit(generate_notes, new_text)
+        return out
+
+    def flush(self):
+        """Transcribe the remaining audio and wait for every pending segment.
+        Returns the last transcript messages for the client."""
+        self._submit(self.segmenter.flush())
+        return self._collect(wait=True)
+
+    def close(self):
+        """Save the session as a normal upload/note (flushes leftover audio first)."""
+        self.flush()
+        transcript = " ".join(self.texts)
+        if not transcript:
+            uploads.update_one(
+                {"_id": self.upload_id},
+                {"$set": {"status": "failed", "error": "no speech received"}}
+            )
+            return {"upload_id": self.upload_id, "note_id": None}
+
+        try:
+            res = notes_from_transcript(self.upload_id, self.user_id, transcript, self.detected_language())
+        except Exception as e:
+            uploads.update_one({"_id": self.upload_id}, {"$set": {"status": "failed", "error": str(e)}})
+            raise
+        uploads.update_one({"_id": self.upload_id}, {"$unset": {"live_transcript": "", "live_notes": ""}})
+        return {"upload_id": self.upload_id, **res}
+
+    def shutdown(self):
+        """Release the session's pools; a rolling note still in flight is dropped."""
+        if self.stt_pool is not None:
+            self.stt_pool.shutdown(wait=False, cancel_futures=True)
+        self.notes_pool.shutdown(wait=False, cancel_futures=True)
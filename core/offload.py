@@ -0,0 +1,76 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import Config
+
+# --- Bounded pools for CPU-heavy work (password hashing, export rendering) ---
+# Under gevent workers `threading` is monkey-patched, so a plain
+# ThreadPoolExecutor would just run the work on greenlets and block the hub.
+# In that case we use gevent's executor, which always uses native threads.
+# hashlib's pbkdf2/scrypt release the GIL, so hashing really runs in
+# parallel. reportlab/python-docx are pure Python and hold the GIL: moving
+# rendering off the hub keeps greenlets switching, but doesn't add CPU.
+# In sync mode a worker serves one request anyway, so run() just calls the
+# function inline instead of paying for a thread hop.
+POOL_SIZES = {
+    "cpu": Config.CPU_POOL_SIZE,
+    "export": Config.EXPORT_WORKERS,
+    "live": Config.LIVE_STT_WORKERS,
+}
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def gevent_active():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("threading")
+
+
+def get_pool(name):
+    """Per-process executor (pools don't survive fork, so key them by pid)."""
+    pid = os.getpid()
+    entry = _pools.get(name)
+    if entry and entry[0] == pid:
+        return entry[1]
+    with _lock:
+        entry = _pools.get(name)
+        if not entry or entry[0] != pid:
+            size = POOL_SIZES[name]
+            if gevent_active():
+                from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+                pool = NativeThreadPoolExecutor(max_workers=size)
+            else:
+                pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=name)
+            entry = _pools[name] = (pid, pool)
+    return entry[1]
+
+
+def io_pool(size):
+    """A private pool for I/O-bound work (e.g. one live session's STT calls).
+    Under gevent its workers are greenlets, so every caller can have its own
+    without tying up native threads. Call shutdown() when done."""
+    return ThreadPoolExecutor(max_workers=size)
+
+
+def submit(name, fn, *args, **kwargs):
+    return get_pool(name).submit(fn, *args, **kwargs)
+
+
+def run(name, fn, *args, **kwargs):
+    """Run `fn` on the named pool and wait for it without pinning the worker."""
+    if not gevent_active():
+        return fn(*args, **kwargs)
+    return submit(name, fn, *args, **kwargs).result()
+
+
+def wait_first(futures):
+    """Like concurrent.futures.wait(FIRST_COMPLETED), for either pool type."""
+    if gevent_active():
+        import gevent
+        done = set(gevent.wait(list(futures), count=1))
+        return done, set(futures) - done
+    return wait(futures, return_when=FIRST_COMPLETED)
@@ -0,0 +1,232 @@
+import cProfile
+import hmac
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from bson import ObjectId
+
+from config import Config
+
+# --- Opt-in profiling ---
+# Nothing here runs unless a request carries the profiling token or a task
+# is started with profile=True; otherwise the only cost is a header lookup
+# per request and a ContextVar.get() per pipeline stage.
+_current = ContextVar("profile", default=None)
+
+MAX_STACKS = 2000  # keep the stored doc well under Mongo's 16MB limit
+TOP_FUNCTIONS = 50
+
+
+def _native(module, name):
+    # the sampler must be a real OS thread even when gevent has patched
+    # `threading`, or it would never run while the profiled code is busy
+    try:
+        from gevent import monkey
+        return monkey.get_original(module, name)
+    except ImportError:
+        return getattr(__import__(module), name)
+
+
+def _current_greenlet():
+    # under gevent all requests share one OS thread, so the thread's frame
+    # alone doesn't tell us whose code is running
+    try:
+        from gevent import monkey
+        if not monkey.is_module_patched("threading"):
+            return None
+        import greenlet
+        return greenlet.getcurrent()
+    except ImportError:
+        return None
+
+
+class StackSampler:
+    """Samples one thread's Python stack every `interval` seconds and
+    counts collapsed stacks (flamegraph.pl / speedscope "folded" format).
+
+    With `glet` (gevent) only that greenlet is sampled: its live frame while
+    it is running, its parked frame while it waits on I/O (so the profile
+    is wall-clock), and never another request that happens to be running
+    on the same thread. A switch between the two checks can still misfile
+    the odd sample.
+    """
+
+    def __init__(self, thread_id, interval, glet=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.glet = glet
+        self.stacks = {}
+        self._stop = False
+
+    def _frame(self):
+        if self.glet is None:
+            return sys._current_frames().get(self.thread_id)
+        if self.glet.dead:
+            return None
+        parked = self.glet.gr_frame
+        if parked is not None:
+            return parked
+        # gr_frame is None only while the greenlet is the one running
+        frame = sys._current_frames().get(self.thread_id)
+        return frame if self.glet.gr_frame is None else None
+
+    def _run(self):
+        sleep = _native("time", "sleep")
+        while not self._stop:
+            frame = self._frame()
+            if frame is not None:
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(parts))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            sleep(self.interval)
+
+    def start(self):
+        _native("_thread", "start_new_thread")(self._run, ())
+
+    def stop(self):
+        self._stop = True
+
+    def folded(self):
+        top = sorted(list(self.stacks.items()), key=lambda kv: kv[1], reverse=True)[:MAX_STACKS]
+        return "\n".join(f"{stack} {count}" for stack, count in top)
+
+
+class Profile:
+    def __init__(self, kind, target, functions=False):
+        self.kind = kind
+        self.target = target
+        self.started = time.perf_counter()
+        self.stages = []
+        self.id = ObjectId()
+        self.sampler = StackSampler(
+            _native("_thread", "get_ident")(), Config.PROFILE_INTERVAL_MS / 1000.0, _current_greenlet()
+        )
+        self.cprofile = cProfile.Profile() if functions else None
+
+    def start(self):
+        self.sampler.start()
+        if self.cprofile:
+            self.cprofile.enable()
+        return self
+
+    def mark(self, stage):
+        self.stages.append({"stage": stage, "at_ms": round((time.perf_counter() - self.started) * 1000, 1)})
+
+    def stop(self):
+        if self.cprofile:
+            self.cprofile.disable()
+        self.sampler.stop()
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 1)
+
+    def _stage_durations(self):
+        out = []
+        for i, s in enumerate(self.stages):
+            end = self.stages[i + 1]["at_ms"] if i + 1 < len(self.stages) else self.duration_ms
+            out.append({**s, "duration_ms": round(end - s["at_ms"], 1)})
+        return out
+
+    def _functions(self):
+        if not self.cprofile:
+            return []
+        stats = pstats.Stats(self.cprofile).stats
+        rows = [
+            {
+                "function": f"{name} ({filename}:{line})",
+                "calls": nc,
+                "tottime_ms": round(tt * 1000, 2),
+                "cumtime_ms": round(ct * 1000, 2),
+            }
+            for (filename, line, name), (cc, nc, tt, ct, callers) in stats.items()
+        ]
+        rows.sort(key=lambda r: r["cumtime_ms"], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+    def to_doc(self):
+        return {
+            "_id": self.id,
+            "kind": self.kind,
+            "target": self.target,
+            "created_at": datetime.utcnow(),
+            "duration_ms": self.duration_ms,
+            "stages": self._stage_durations(),
+            "functions": self._functions(),
+            "folded": self.sampler.folded(),
+        }
+
+
+def save(profile):
+    from models.mongo_models import profiles
+    return str(profiles.insert_one(profile.to_doc()).inserted_id)
+
+
+def mark(stage):
+    """Record a pipeline stage on the active profile, if any."""
+    p = _current.get()
+    if p is not None:
+        p.mark(stage)
+
+
+@contextmanager
+def profiled(kind, target, enabled=True, functions=False):
+    """Profile the enclosed block. Yields a dict that gets `profile_id`
+    once the profile has been stored; a no-op when not enabled."""
+    result = {}
+    if not enabled:
+        yield result
+        return
+    p = Profile(kind, target, functions=functions).start()
+    token = _current.set(p)
+    try:
+        yield result
+    finally:
+        _current.reset(token)
+        p.stop()
+        try:
+            result["profile_id"] = save(p)
+        except Exception:
+            pass
+
+
+# --- Flask hooks ---
+def requested(req):
+    """True when the request carries the admin profiling token."""
+    sent = req.headers.get("X-Profile")
+    if not Config.PROFILE_TOKEN or not sent:
+        return False
+    return hmac.compare_digest(sent.encode("utf-8"), Config.PROFILE_TOKEN.encode("utf-8"))
+
+
+def init_app(app):
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_profile():
+        if requested(request):
+            g._profile = Profile("request", f"{request.method} {request.path}").start()
+            g._profile_token = _current.set(g._profile)
+
+    @app.after_request
+    def _stop_request_profile(response):
+        p = g.pop("_profile", None)
+        if p is not None:
+            _current.reset(g.pop("_profile_token"))
+            response.headers["X-Profile-Id"] = str(p.id)
+
+            # stop when the body has been sent, so streamed responses
+            # (e.g. /download/zip) are profiled while they produce it
+            def _finish():
+                p.stop()
+                try:
+                    save(p)
+                except Exception:
+                    pass
+            response.call_on_close(_finish)
+        return response
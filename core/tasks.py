@@ -1,13 +1,30 @@
+import requests
+from datetime import datetime
+from celery import chain, chord, group
 from celery_worker import celery
-from core.ai_pipeline import process_upload
+from bson import ObjectId
+from core.ai_pipeline import process_upload, upload_stream_to_assemblyai
+from core import profiling
+from config import Config
+from models.mongo_models import uploads, batches, get_fs
 
 @celery.task(name="tasks.process_upload_task")
-def process_upload_task(upload_id, file_path, user_id, language=None):
+def process_upload_task(upload_id, file_path, user_id, language=None, profile=False):
     """
     Background Celery task for processing uploads.
     Ensures return is JSON serializable.
+    With `profile` (or PROFILE_TASKS) stage and function timings are stored
+    in `profiles` and linked from the upload doc as `profile_id`.
     """
-    result = process_upload(upload_id, file_path, user_id, language=language)
+    enabled = profile or Config.PROFILE_TASKS
+    prof = {}
+    try:
+        with profiling.profiled("task", upload_id, enabled=enabled, functions=True) as prof:
+            result = process_upload(upload_id, file_path, user_id, language=language)
+    finally:
+        # link failed runs too, those are usually the interesting ones
+        if prof.get("profile_id"):
+            uploads.update_one({"_id": upload_id}, {"$set": {"profile_id": prof["profile_id"]}})
 
     # ObjectId ko string banado agar hai
     if isinstance(result, dict):
@@ -17,3 +34,121 @@ def process_upload_task(upload_id, file_path, user_id, language=None):
             result["note_id"] = str(result["note_id"])
 
     return result
+
+
+# --- Batch processing ---
+def _send_staged_file(upload_id, file_id):
+    """Stream a batch file from GridFS to AssemblyAI, then drop the staged copy."""
+    fs = get_fs()
+    oid = ObjectId(file_id)
+    try:
+        with fs.open_download_stream(oid) as stream:
+            upload_url = upload_stream_to_assemblyai(stream)
+    finally:
+        try:
+            fs.delete(oid)
+        except Exception:
+            pass
+    uploads.update_one(
+        {"_id": upload_id},
+        {"$set": {"upload_url": upload_url, "status": "queued"}, "$unset": {"staged_file_id": ""}}
+    )
+    return upload_url
+
+
+@celery.task(name="tasks.process_batch_item_task")
+def process_batch_item_task(upload_id, file_path, user_id, language=None, is_url=False, staged=False):
+    """
+    One file of a batch. Never raises: a failed file is marked failed on
+    its upload doc and must not abort the rest of its chain or the batch
+    chord. With `staged`, `file_path` is a GridFS id and the provider
+    upload happens here instead of in the web request.
+    """
+    if staged:
+        try:
+            file_path = _send_staged_file(upload_id, file_path)
+        except Exception as e:
+            error = f"provider upload failed: {e}"
+            uploads.update_one({"_id": upload_id}, {"$set": {"status": "failed", "error": error}})
+            return {"upload_id": upload_id, "status": "failed", "error": error}
+        is_url = True
+    try:
+        result = process_upload(upload_id, file_path, user_id, language=language, is_url=is_url)
+        return {"upload_id": upload_id, "status": "done", "note_id": str(result["note_id"])}
+    except Exception as e:
+        return {"upload_id": upload_id, "status": "failed", "error": str(e)}
+
+
+def batch_summary(batch_id):
+    """Aggregate the batch's upload docs into one status document."""
+    items = list(uploads.find(
+        {"batch_id": batch_id},
+        {"filename": 1, "status": 1, "note_id": 1, "progress": 1, "error": 1},
+    ))
+    counts = {"done": 0, "failed": 0, "pending": 0}
+    for u in items:
+        s = u.get("status")
+        counts[s if s in ("done", "failed") else "pending"] += 1
+    percent = sum(u.get("progress", {}).get("percent", 0) for u in items) / len(items) if items else 0
+    return {
+        "total": len(items),
+        "counts": counts,
+        "percent": round(percent, 1),
+        "items": [
+            {
+                "upload_id": u["_id"],
+                "filename": u.get("filename"),
+                "status": u.get("status"),
+                "note_id": u.get("note_id"),
+                "error": u.get("error"),
+            }
+            for u in items
+        ],
+    }
+
+
+@celery.task(name="tasks.finalize_batch_task")
+def finalize_batch_task(results, batch_id):
+    """Chord callback: runs once after every file of the batch has finished."""
+    summary = batch_summary(batch_id)
+    counts = summary["counts"]
+    if counts["failed"] == 0:
+        status = "done"
+    elif counts["done"] == 0:
+        status = "failed"
+    else:
+        status = "partial"
+
+    batches.update_one(
+        {"_id": batch_id},
+        {"$set": {"status": status, "counts": counts, "finished_at": datetime.utcnow()}}
+    )
+
+    b = batches.find_one({"_id": batch_id}, {"callback_url": 1})
+    if b and b.get("callback_url"):
+        try:
+            requests.post(
+                b["callback_url"],
+                json={"batch_id": batch_id, "status": status, **summary},
+                timeout=10,
+            )
+        except Exception:
+            pass
+    return {"batch_id": batch_id, "status": status}
+
+
+def dispatch_batch(batch_id, items, user_id, language, parallelism):
+    """
+    Fan out a batch as `parallelism` chains (each works through its share
+    of files one by one) under a chord, so at most `parallelism` files of
+    this batch are in flight at once and the callback fires exactly once.
+    """
+    sigs = [
+        process_batch_item_task.si(
+            it["upload_id"], it["source"], user_id, language, it["is_url"], it.get("staged", False)
+        )
+        for it in items
+    ]
+    parallelism = max(1, min(parallelism, len(sigs)))
+    lanes = [chain(*sigs[i::parallelism]) for i in range(parallelism)]
+    return chord(group(lanes))(finalize_batch_task.s(batch_id))
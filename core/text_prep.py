@@ -0,0 +1,241 @@
+import math
+import re
+
+import numpy as np
+
+# --- Filler / disfluency removal (one compiled pass) ---
+# Removed in one pass:
+# - um/uh/erm/hmm anywhere (with the commas around them)
+# - "like" / "you know" only when used as fillers: set off by commas
+#   ("we, like, ship") or opening a clause with a comma ("You know, ..."),
+#   so "would like to" or "do you know X?" are left alone
+# - stutters of three or more repeats, "the the the" -> "the". Doubles are
+#   kept since "that that" / "had had" are often real speech.
+FILLER_RE = re.compile(
+    r"(?:,\s*)?\b(?:u+m+|u+h+|e+r+m+|h+m+)\b,?"
+    r"|,\s*(?:like|you know)\s*,"
+    r"|(?:^|(?<=[.!?;:]\s))(?:like|you know),\s*"
+    r"|\b(\w+)(?:\s+\1\b){2,}",
+    re.IGNORECASE,
+)
+
+# CJK terminators aren't followed by a space, so the whitespace is optional there
+SENTENCE_RE = re.compile(r"(?<=[.!?۔؟])\s+|(?<=[。！？])\s*")
+
+# CJK has no spaces between words: score it per character instead
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+WORD_RE = re.compile(f"[{_CJK}]|[^\\W{_CJK}]+")
+
+# pseudo-sentence size when the transcript has no punctuation at all
+FALLBACK_CHUNK_WORDS = 40
+FALLBACK_CHUNK_CHARS = 80
+
+# MMR trade-off between relevance and novelty, and the cosine similarity
+# above which a sentence counts as a near-duplicate of one already kept
+MMR_LAMBDA = 0.7
+NEAR_DUPLICATE_SIM = 0.85
+
+
+def _filler_sub(m):
+    return m.group(1) or ""
+
+
+def clean_text(text):
+    if not text:
+        return text
+    text = FILLER_RE.sub(_filler_sub, text)
+    return " ".join(text.split())
+
+
+# --- Token counting ---
+# Groq's llama-3.1 tokenizer is a superset of tiktoken's cl100k_base, so
+# cl100k gives a close count. Falls back to a script-aware estimate when
+# tiktoken isn't installed.
+TOKENIZER_ENCODING = "cl100k_base"
+_encoder = None
+
+
+def _get_encoder():
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception:
+            _encoder = False
+    return _encoder or None
+
+
+def _estimate_tokens(text):
+    # ~4 chars/token for ASCII, but Urdu/Arabic/CJK etc. run close to a
+    # token per character, which is where chars/4 was badly off.
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(math.ceil(ascii_chars / 4.0 + (len(text) - ascii_chars) * 0.9))
+
+
+def count_tokens(text):
+    if not text:
+        return 0
+    enc = _get_encoder()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return _estimate_tokens(text)
+
+
+def _count_tokens_many(texts):
+    enc = _get_encoder()
+    if enc is not None:
+        return [len(t) for t in enc.encode_ordinary_batch(texts)]
+    return [_estimate_tokens(t) for t in texts]
+
+
+def truncate_tokens(text, max_tokens):
+    """Cut `text` to at most `max_tokens` tokens (not chars)."""
+    enc = _get_encoder()
+    if enc is not None:
+        return enc.decode(enc.encode(text, disallowed_special=())[:max_tokens])
+    # estimate-only: binary search for the longest prefix that fits
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+# --- Extractive compression ---
+def split_sentences(text):
+    sentences = [s.strip() for s in SENTENCE_RE.split(text) if s.strip()]
+    if len(sentences) > 1:
+        return sentences
+    # unpunctuated transcript -> fixed-size word windows, or character
+    # windows when there's (almost) no whitespace to split on
+    words = text.split()
+    if not words or len(text) / len(words) > 20:
+        text = text.strip()
+        return [
+            text[i:i + FALLBACK_CHUNK_CHARS]
+            for i in range(0, len(text), FALLBACK_CHUNK_CHARS)
+        ]
+    return [
+        " ".join(words[i:i + FALLBACK_CHUNK_WORDS])
+        for i in range(0, len(words), FALLBACK_CHUNK_WORDS)
+    ]
+
+
+def _tfidf(sentences):
+    """
+    Unit-length TF-IDF rows as flat (sentence, term, weight) arrays, so
+    everything below stays linear in transcript length instead of building
+    a dense matrix.
+    """
+    n = len(sentences)
+    vocab = {}
+    sent_ids, term_ids = [], []
+    for i, s in enumerate(sentences):
+        for w in WORD_RE.findall(s.lower()):
+            sent_ids.append(i)
+            term_ids.append(vocab.setdefault(w, len(vocab)))
+    if not term_ids:
+        return None
+
+    v = len(vocab)
+    pairs, tf = np.unique(
+        np.asarray(sent_ids, dtype=np.int64) * v + np.asarray(term_ids, dtype=np.int64),
+        return_counts=True,
+    )
+    sent, term = pairs // v, pairs % v
+
+    df = np.bincount(term, minlength=v)
+    idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+    w = (1.0 + np.log(tf)) * idf[term]
+
+    norms = np.sqrt(np.bincount(sent, weights=w * w, minlength=n))
+    norms[norms == 0] = 1.0
+    return sent, term, w / norms[sent], v
+
+
+def score_sentences(sentences):
+    """TF-IDF centrality: cosine similarity of each sentence to the centroid
+    of the whole meeting."""
+    n = len(sentences)
+    m = _tfidf(sentences)
+    if m is None:
+        return np.zeros(n)
+    sent, term, w_unit, v = m
+    centroid = np.bincount(term, weights=w_unit, minlength=v) / n
+    return np.bincount(sent, weights=w_unit * centroid[term], minlength=n)
+
+
+def _dedupe(sentences):
+    # exact repeats (ignoring case/punctuation) only need to be scored once
+    seen, out = set(), []
+    for s in sentences:
+        key = " ".join(WORD_RE.findall(s.lower()))
+        if key and key not in seen:
+            seen.add(key)
+            out.append(s)
+    return out
+
+
+def compress_extractive(text, max_tokens):
+    """
+    Keep the most informative sentences from across the whole transcript
+    until `max_tokens` is used up, then put them back in meeting order.
+
+    Selection is MMR (maximal marginal relevance): centrality minus
+    similarity to what's already kept, so a point repeated all meeting
+    long is kept once and the one-off decisions/action items still fit.
+    """
+    sentences = _dedupe(split_sentences(text))
+    if not sentences:
+        return text
+    n = len(sentences)
+    lengths = np.asarray(_count_tokens_many(sentences))
+    m = _tfidf(sentences)
+    if m is None:
+        return truncate_tokens(text, max_tokens)
+    sent, term, w_unit, v = m
+
+    centroid = np.bincount(term, weights=w_unit, minlength=v) / n
+    rel = np.bincount(sent, weights=w_unit * centroid[term], minlength=n)
+    if rel.max() > 0:
+        rel = rel / rel.max()
+
+    max_sim = np.zeros(n)
+    open_ = lengths <= max_tokens
+    keep, used = [], 0
+    while open_.any():
+        mmr = np.where(open_, MMR_LAMBDA * rel - (1 - MMR_LAMBDA) * max_sim, -np.inf)
+        i = int(np.argmax(mmr))
+        keep.append(i)
+        used += lengths[i]
+        open_[i] = False
+
+        # cosine similarity of every sentence to the one just picked
+        picked = np.zeros(v)
+        rows = sent == i
+        picked[term[rows]] = w_unit[rows]
+        sim = np.bincount(sent, weights=w_unit * picked[term], minlength=n)
+        max_sim = np.maximum(max_sim, sim)
+        open_ &= (lengths <= max_tokens - used) & (max_sim < NEAR_DUPLICATE_SIM)
+
+    if not keep:
+        # every sentence alone is over budget -> hard cut the best one
+        return truncate_tokens(sentences[int(np.argmax(rel))], max_tokens)
+    keep.sort()
+    return " ".join(sentences[i] for i in keep)
+
+
+def optimize_for_tokens(text, max_tokens=3000):
+    """
+    Fit `text` into `max_tokens` (real tokenizer count). Text already under
+    budget is returned unchanged.
+    """
+    if not text:
+        return text
+    if count_tokens(text) <= max_tokens:
+        return text
+    return compress_extractive(text, max_tokens)
@@ -1,4 +1,6 @@
+import io
 import os
+import zipfile
 import requests
 # from fpdf import FPDF
 from docx import Document
@@ -84,10 +86,55 @@ def export_to_docx(notes_text, output_path):
         lines = list(notes_text)
     for line in lines:
         doc.add_paragraph(str(line))
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if isinstance(output_path, str):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
     doc.save(output_path)
     return output_path
 
+# --- In-memory export (for bulk/zip downloads) ---
+def render_export(notes_text, fmt):
+    """Render notes to PDF/DOCX bytes without touching disk."""
+    buf = io.BytesIO()
+    if fmt == "pdf":
+        export_to_pdf(notes_text, buf)
+    else:
+        export_to_docx(notes_text, buf)
+    return buf.getvalue()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that hands back whatever was written."""
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive chunk by chunk from an iterable of (name, bytes).
+    The sink isn't seekable, so zipfile writes data descriptors and every
+    entry can be flushed to the client as soon as it's added.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
 # --- Extract Audio from Video ---
 def extract_audio_from_video(video_path, output_path, duration=120):
     """
@@ -143,28 +190,3 @@ def translate_text(text, src='auto', target='en'):
     except Exception:
         # translator not available or failed -> return original
         return text
-
-# --- Token/text optimizer (heuristic) ---
-def optimize_for_tokens(text, max_tokens=3000):
-    """
-    Heuristic to reduce text length to approximately max_tokens.
-    Approx tokens = chars/4 (simple estimate). Tries to cut at sentence boundary.
-    """
-    if not text:
-        return text
-    approx_tokens = len(text) / 4.0
-    if approx_tokens <= max_tokens:
-        return text
-
-    ratio = max_tokens / approx_tokens
-    max_chars = max(200, int(len(text) * ratio))  # ensure some minimum
-    cut = text[:max_chars]
-    # try to cut at last sentence end
-    last_dot = max(cut.rfind('.'), cut.rfind('!\n'), cut.rfind('?\n'))
-    if last_dot and last_dot > int(0.5 * max_chars):
-        return cut[:last_dot+1]
-    # fallback: cut at last newline
-    last_nl = cut.rfind('\n')
-    if last_nl and last_nl > 0:
-        return cut[:last_nl]
-    return cut
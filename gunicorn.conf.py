@@ -0,0 +1,14 @@
+# gunicorn.conf.py
+import os
+
+# SERVE_MODE=sync   -> one request per worker (gunicorn default)
+# SERVE_MODE=gevent -> green workers: slow provider uploads / Mongo / LLM
+#                      calls yield instead of pinning the worker; CPU work
+#                      goes to native threads via core.offload
+SERVE_MODE = os.getenv("SERVE_MODE", "sync")
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+worker_class = "gevent" if SERVE_MODE == "gevent" else "sync"
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 500))  # gevent only
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))  # gunicorn's default
@@ -1,14 +1,147 @@
-from pymongo import MongoClient, ASCENDING
+import os
+import threading
+import time
+
+import gridfs
+from pymongo import MongoClient, ASCENDING, ReadPreference
+from pymongo.write_concern import WriteConcern
 from config import Config
 from datetime import datetime
 
-client = MongoClient(Config.MONGO_URI)
-db = client["talktotext"] 
-users = db.users
-notes = db.notes
-uploads = db.uploads
+# --- Connection manager ---
+# The client is created lazily on first use in each process. gunicorn and
+# Celery prefork their children after importing this module, and a
+# MongoClient must not be shared across fork, so we key it by pid and build
+# a fresh (sized) pool in every child.
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+# index creation state for this process (see _ensure_indexes_once)
+_indexes = {"pid": None, "done": False, "next_try": 0.0, "backoff": 0.0, "logged": False}
+_indexes_lock = threading.Lock()
+INDEX_RETRY_MIN = 5.0
+INDEX_RETRY_MAX = 300.0
+
+
+def _new_client():
+    return MongoClient(
+        Config.MONGO_URI,
+        maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+        minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=Config.MONGO_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=Config.MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=Config.MONGO_SOCKET_TIMEOUT_MS,
+        serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        connect=False,
+    )
+
+
+def get_client():
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _lock:
+            if _client is None or _client_pid != pid:
+                # don't close() an inherited client: its sockets belong to the parent
+                _client = _new_client()
+                _client_pid = pid
+    client = _client
+    if not (_indexes["done"] and _indexes["pid"] == pid):
+        _ensure_indexes_once(client, pid)
+    return client
+
+
+def _ensure_indexes_once(client, pid):
+    """
+    Ensure indexes once per process, separately from client creation. A
+    failure (server selection timeout, duplicate emails blocking the unique
+    index, ...) is logged once and retried with exponential backoff rather
+    than on every operation. Only one thread tries at a time; the others
+    carry on without waiting.
+    """
+    if not _indexes_lock.acquire(blocking=False):
+        return
+    try:
+        if _indexes["pid"] != pid:
+            _indexes.update(pid=pid, done=False, next_try=0.0, backoff=0.0, logged=False)
+        if _indexes["done"] or time.monotonic() < _indexes["next_try"]:
+            return
+        try:
+            ensure_indexes(client["talktotext"])
+            _indexes["done"] = True
+            if _indexes["logged"]:
+                print("✅ Mongo indexes created")
+        except Exception as e:
+            backoff = min(INDEX_RETRY_MAX, max(INDEX_RETRY_MIN, _indexes["backoff"] * 2))
+            _indexes.update(backoff=backoff, next_try=time.monotonic() + backoff)
+            if not _indexes["logged"]:
+                print(f"⚠️ Mongo index creation failed, retrying with backoff: {e}")
+                _indexes["logged"] = True
+    finally:
+        _indexes_lock.release()
+
+
+def get_db():
+    return get_client()["talktotext"]
+
+
+def get_fs():
+    """GridFS bucket holding batch files until a worker has sent them on."""
+    return gridfs.GridFSBucket(get_db(), bucket_name="batch_files")
+
+
+def close_client():
+    """Close this process's client (e.g. on worker shutdown)."""
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+class LazyCollection:
+    """
+    Module-level stand-in for a pymongo Collection. Resolves against the
+    current process's client on every access, with optional per-collection
+    write concern / read preference.
+    """
+
+    def __init__(self, name, write_concern=None, read_preference=None):
+        self.name = name
+        self.write_concern = write_concern
+        self.read_preference = read_preference
+
+    def _collection(self):
+        return get_db().get_collection(
+            self.name,
+            write_concern=self.write_concern,
+            read_preference=self.read_preference,
+        )
+
+    def __getattr__(self, attr):
+        return getattr(self._collection(), attr)
+
+
+# Notes are the final product -> wait for a majority.
+# Progress updates are frequent and disposable -> w=1 (or 0 for fire-and-forget).
+# Read-heavy endpoints may read from a secondary if the deployment has one.
+_read_pref = ReadPreference.SECONDARY_PREFERRED if Config.MONGO_READ_SECONDARY else None
+
+users = LazyCollection("users")
+notes = LazyCollection("notes", write_concern=WriteConcern(w="majority"))
+uploads = LazyCollection("uploads")
+batches = LazyCollection("batches")
+profiles = LazyCollection("profiles")
+progress_uploads = LazyCollection("uploads", write_concern=WriteConcern(w=Config.MONGO_PROGRESS_W))
+notes_read = LazyCollection("notes", read_preference=_read_pref)
+
 
 # Indexes
-users.create_index([("email", ASCENDING)], unique=True)
-notes.create_index([("user_id", ASCENDING), ("created_at", ASCENDING)])
-uploads.create_index([("status", ASCENDING)]) 
+def ensure_indexes(db):
+    db.users.create_index([("email", ASCENDING)], unique=True)
+    db.notes.create_index([("user_id", ASCENDING), ("created_at", ASCENDING)])
+    db.uploads.create_index([("status", ASCENDING)])
+    db.uploads.create_index([("batch_id", ASCENDING)])
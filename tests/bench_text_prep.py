@@ -0,0 +1,45 @@
+import random
+import time
+
+from core.text_prep import clean_text, count_tokens, optimize_for_tokens
+
+# ~150 spoken words/minute for 3 hours
+WORDS = 150 * 180
+
+VOCAB = (
+    "budget release roadmap customer churn hiring design review sprint "
+    "deadline migration database latency onboarding pricing contract "
+    "marketing launch feedback metrics retention backlog testing deploy"
+).split()
+FILLERS = ["um", "uh", "you know", "like", "so", "and", "the", "we", "we"]
+
+
+def make_transcript(n_words, seed=0):
+    rnd = random.Random(seed)
+    out, count = [], 0
+    while count < n_words:
+        n = rnd.randint(6, 25)
+        words = [rnd.choice(VOCAB + FILLERS) for _ in range(n)]
+        out.append(" ".join(words).capitalize() + rnd.choice([".", ".", "?", "!"]))
+        count += n
+    return " ".join(out)
+
+
+def bench(max_tokens=3000):
+    text = make_transcript(WORDS)
+    mb = len(text.encode("utf-8")) / 1e6
+
+    t0 = time.perf_counter()
+    cleaned = clean_text(text)
+    t1 = time.perf_counter()
+    prompt = optimize_for_tokens(cleaned, max_tokens=max_tokens)
+    t2 = time.perf_counter()
+
+    print(f"Transcript: {len(text.split())} words, {mb:.2f} MB, {count_tokens(text)} tokens")
+    print(f"clean_text:          {(t1 - t0) * 1000:.1f} ms ({mb / (t1 - t0):.1f} MB/s)")
+    print(f"optimize_for_tokens: {(t2 - t1) * 1000:.1f} ms")
+    print(f"Prompt: {count_tokens(prompt)} tokens (budget {max_tokens})")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,99 @@
+"""
+Mongo pool load test: forks N worker processes (like gunicorn/Celery
+prefork), each running T threads of history-style reads and progress-style
+writes, then prints server connection counts and latency percentiles.
+
+    MONGO_URI=... python -m tests.load_mongo_pool --workers 8 --threads 8
+"""
+import argparse
+import multiprocessing as mp
+import threading
+import time
+import uuid
+
+from models.mongo_models import get_client, get_db, notes_read, progress_uploads, uploads
+
+
+def connections():
+    return get_db().command("serverStatus")["connections"]["current"]
+
+
+def worker(threads, ops, out):
+    upload_id = f"loadtest-{uuid.uuid4()}"
+    uploads.insert_one({"_id": upload_id, "status": "uploaded"})
+    lat = {"read": [], "write": []}
+
+    def run():
+        for i in range(ops):
+            t0 = time.perf_counter()
+            list(notes_read.find({"user_id": "loadtest"}).sort("created_at", -1).limit(50))
+            lat["read"].append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            progress_uploads.update_one(
+                {"_id": upload_id},
+                {"$set": {"status": "processing", "progress": {"stage": "processing", "percent": i}}},
+            )
+            lat["write"].append(time.perf_counter() - t0)
+
+    ts = [threading.Thread(target=run) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    uploads.delete_one({"_id": upload_id})
+    out.put(lat)
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--ops", type=int, default=200)
+    args = ap.parse_args()
+
+    # touch the client in the parent first, like an app that imported
+    # models before gunicorn forked
+    get_client()
+    before = connections()
+
+    ctx = mp.get_context("fork")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(args.threads, args.ops, out)) for _ in range(args.workers)]
+    # sample server connections while the workers are running
+    samples, running = [before], threading.Event()
+    running.set()
+
+    def sample():
+        while running.is_set():
+            samples.append(connections())
+            time.sleep(0.2)
+
+    t0 = time.perf_counter()
+    for p in procs:
+        p.start()
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    results = [out.get() for _ in procs]
+    running.clear()
+    sampler.join()
+    peak = max(samples)
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    reads = [x for r in results for x in r["read"]]
+    writes = [x for r in results for x in r["write"]]
+    print(f"Workers: {args.workers} x {args.threads} threads, {len(reads) + len(writes)} ops in {elapsed:.1f}s")
+    print(f"Connections: before={before} peak={peak} after={connections()}")
+    print(f"read  p50={pct(reads, 0.5):.1f}ms p99={pct(reads, 0.99):.1f}ms")
+    print(f"write p50={pct(writes, 0.5):.1f}ms p99={pct(writes, 0.99):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
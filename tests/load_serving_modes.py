@@ -0,0 +1,104 @@
+"""
+Load test for comparing serving modes. Start the provider stub, then the
+server in one mode, run this with a label, restart in the other mode and
+run again:
+
+    python -m tests.stub_assemblyai --port 9000
+    ASSEMBLYAI_BASE_URL=http://localhost:9000/v2 gunicorn -c gunicorn.conf.py wsgi:app
+    python -m tests.load_serving_modes --label sync
+
+    ASSEMBLYAI_BASE_URL=http://localhost:9000/v2 SERVE_MODE=gevent gunicorn -c gunicorn.conf.py wsgi:app
+    python -m tests.load_serving_modes --label gevent
+
+Prints requests/sec and p50/p99 latency for login, history and upload.
+The upload scenario posts a small WAV as multipart, so the request
+includes the provider upload (to the stub). Don't run a Celery worker
+during the test; clear the queued tasks afterwards with
+`celery -A celery_worker.celery purge`.
+"""
+import argparse
+import io
+import time
+import uuid
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE = "http://localhost:8000/api"
+
+
+def sample_wav(seconds=5, sample_rate=16000):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(b"\x00\x00" * seconds * sample_rate)
+    return buf.getvalue()
+
+
+AUDIO = sample_wav()
+
+
+def make_user():
+    email = f"load-{uuid.uuid4().hex[:8]}@example.com"
+    r = requests.post(BASE + "/auth/register", json={
+        "name": "Load Test", "email": email, "phone": "0", "password": "load-test-pass"
+    })
+    r.raise_for_status()
+    return email, r.json()["token"]
+
+
+def scenarios(email, token):
+    auth = {"Authorization": f"Bearer {token}"}
+    return {
+        "login": lambda s: s.post(BASE + "/auth/login", json={"email": email, "password": "load-test-pass"}),
+        "history": lambda s: s.get(BASE + "/history", headers=auth),
+        "upload": lambda s: s.post(BASE + "/upload", headers=auth, files={"file": ("load.wav", AUDIO, "audio/wav")}),
+    }
+
+
+def run(call, total, concurrency):
+    lat, errors = [], 0
+
+    def one(_):
+        with requests.Session() as s:
+            t0 = time.perf_counter()
+            r = call(s)
+            return time.perf_counter() - t0, r.status_code < 400
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        for dt, ok in ex.map(one, range(total)):
+            lat.append(dt)
+            errors += not ok
+    elapsed = time.perf_counter() - t0
+    lat.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": lat[len(lat) // 2] * 1000,
+        "p99": lat[min(len(lat) - 1, int(len(lat) * 0.99))] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--label", default="sync")
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--only", nargs="*", default=["login", "history", "upload"])
+    args = ap.parse_args()
+
+    email, token = make_user()
+    for name, call in scenarios(email, token).items():
+        if name not in args.only:
+            continue
+        res = run(call, args.requests, args.concurrency)
+        print(f"[{args.label}] {name:8s} {res['rps']:7.1f} req/s  "
+              f"p50={res['p50']:.0f}ms p99={res['p99']:.0f}ms errors={res['errors']}")
+
+
+if __name__ == "__main__":
+    main()
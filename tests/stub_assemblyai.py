@@ -0,0 +1,69 @@
+"""
+Stand-in for the AssemblyAI endpoints the app calls, so load tests never
+queue paid jobs. Every response waits --latency-ms first, like a real
+provider round trip.
+
+    python -m tests.stub_assemblyai --port 9000 --latency-ms 300
+    ASSEMBLYAI_BASE_URL=http://localhost:9000/v2 gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import argparse
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TEXT = "This is a stubbed transcript used for load testing."
+
+
+class Handler(BaseHTTPRequestHandler):
+    latency = 0.3
+
+    def _reply(self, body):
+        time.sleep(self.latency)
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _drain(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().strip() or b"0", 16)
+                self.rfile.read(size + 2)
+                if size == 0:
+                    return
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_POST(self):
+        self._drain()
+        if self.path == "/v2/upload":
+            self._reply({"upload_url": f"http://{self.headers['Host']}/files/{uuid.uuid4().hex}"})
+        elif self.path == "/v2/transcript":
+            self._reply({"id": uuid.uuid4().hex, "status": "queued"})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        if self.path.startswith("/v2/transcript/"):
+            self._reply({"status": "completed", "text": TEXT, "language_code": "en"})
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=9000)
+    ap.add_argument("--latency-ms", type=int, default=300)
+    args = ap.parse_args()
+    Handler.latency = args.latency_ms / 1000.0
+    print(f"Stub AssemblyAI on http://localhost:{args.port}/v2 ({args.latency_ms}ms per call)")
+    ThreadingHTTPServer(("", args.port), Handler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from core.text_prep import clean_text, count_tokens, optimize_for_tokens
+
+REPEATED = [
+    "The release budget for the next quarter needs to be reviewed again.",
+    "We keep talking about the release budget for the next quarter.",
+    "The release budget is still the main topic for the next quarter.",
+]
+ONE_OFFS = [
+    "Action item: Priya sends the signed vendor contract to legal by Friday.",
+    "Decision: we migrate billing to the new provider in March.",
+    "Omar owns the onboarding checklist and reports back next week.",
+]
+
+
+def test_distinct_action_items_survive_compression():
+    sentences = REPEATED * 360
+    for k, line in enumerate(ONE_OFFS):
+        sentences.insert(200 + k * 300, line)
+    text = " ".join(sentences)
+
+    out = optimize_for_tokens(text, max_tokens=400)
+
+    assert count_tokens(out) <= 400
+    for line in ONE_OFFS:
+        assert line in out
+    # each repeated point is kept once, not over and over
+    for line in REPEATED:
+        assert out.count(line) <= 1
+
+
+def test_clean_text_keeps_non_filler_like_and_you_know():
+    assert clean_text("we would like to ship") == "we would like to ship"
+    assert clean_text("It looks like rain") == "It looks like rain"
+    assert clean_text("do you know the date?") == "do you know the date?"
+    assert clean_text("We had had enough. Bye bye.") == "We had had enough. Bye bye."
+
+
+def test_clean_text_removes_fillers():
+    assert clean_text("Um, we, like, ship it, uh, today") == "we ship it today"
+    assert clean_text("You know, the the the plan works") == "the plan works"